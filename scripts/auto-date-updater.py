@@ -6,32 +6,73 @@ Claude Code에서 사용하기 위한 도구
 
 import re
 import sys
-from datetime import datetime
+import functools
+from datetime import date, datetime
 from pathlib import Path
 
+# 형식 키 → strftime 포맷
+_FORMATS = {
+    'kr': '%Y년 %m월 %d일',
+    'iso': '%Y-%m-%d',
+    'dot': '%Y.%m.%d',
+    'slash': '%Y/%m/%d',
+    'us': '%B %d, %Y',
+}
+
+# 날짜 필드 패턴 (모듈 로드 시 1회만 컴파일)
+# **라벨**: 형태의 6개 패턴은 하나의 alternation으로 합쳐 전체 스캔 횟수를
+# 8회 → 3회로 줄임 (마크다운 치환은 스캔 길이에 비례하는 작업)
+# - **작성일**: 2025년 01월 20일 등
+LABEL_RE = re.compile(
+    r'(\*\*(?P<label>작성일|작성 일자|완료일|수정일|보류 일자|취소 일자)\*\*:\s*)'
+    r'\d{4}년\s*\d{1,2}월\s*\d{1,2}일'
+)
+# ### 오늘 (2025.08.21)
+TODAY_HEADER_RE = re.compile(r'(###\s*오늘\s*\()(\d{4}\.\d{2}\.\d{2})(\))')
+# Date: 2025-08-21
+DATE_LINE_RE = re.compile(r'(Date:\s*)(\d{4}-\d{2}-\d{2})')
+
+# regex를 돌리기 전의 저렴한 사전 검사용 리터럴 —
+# 위 패턴 중 하나라도 매칭되려면 아래 문자열 중 하나는 반드시 포함됨
+# (C 레벨 substring 검색이라 매칭 없는 파일은 regex 비용 없이 건너뜀)
+_ANCHORS = ('작성일', '작성 일자', '완료일', '수정일',
+            '보류 일자', '취소 일자', '오늘', 'Date:')
+
+@functools.lru_cache(maxsize=16)
+def _format_date(format_type, day):
+    """지정된 날짜를 형식화 (같은 날·같은 형식은 캐시에서 반환)"""
+    fmt = _FORMATS.get(format_type, _FORMATS['kr'])
+    return day.strftime(fmt)
+
 def get_today_date(format_type='kr'):
     """오늘 날짜를 지정된 형식으로 반환"""
-    today = datetime.now()
-    
-    formats = {
-        'kr': today.strftime('%Y년 %m월 %d일'),
-        'iso': today.strftime('%Y-%m-%d'),
-        'dot': today.strftime('%Y.%m.%d'),
-        'slash': today.strftime('%Y/%m/%d'),
-        'us': today.strftime('%B %d, %Y')
-    }
-    
-    return formats.get(format_type, formats['kr'])
+    # 날짜를 캐시 키에 포함하므로 장기 실행 프로세스에서도 자정을 넘기면
+    # 새 날짜로 형식화됨
+    return _format_date(format_type, date.today())
 
 def update_date_in_file(file_path, pattern, new_date):
-    """파일 내의 날짜 패턴을 새 날짜로 업데이트"""
+    """파일 내의 날짜 패턴을 새 날짜로 업데이트
+
+    pattern은 문자열 또는 미리 컴파일된 re.Pattern 모두 허용
+    (루프에서 호출할 때는 컴파일된 패턴을 넘겨 재컴파일을 피함)
+    """
     path = Path(file_path)
     if not path.exists():
         print(f"파일이 존재하지 않습니다: {file_path}")
         return False
-    
+
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+
+    # 치환 문자열에 역참조가 없으면 함수 치환을 사용해
+    # re.sub 내부의 템플릿 파싱을 건너뜀
+    if '\\' in new_date:
+        replacement = new_date
+    else:
+        replacement = lambda m: new_date
+
     content = path.read_text(encoding='utf-8')
-    updated_content = re.sub(pattern, new_date, content)
+    updated_content = pattern.sub(replacement, content)
     
     if content != updated_content:
         path.write_text(updated_content, encoding='utf-8')
@@ -46,36 +87,29 @@ def update_markdown_date_fields(file_path):
     today_kr = get_today_date('kr')
     today_iso = get_today_date('iso')
     today_dot = get_today_date('dot')
-    
-    patterns = [
-        # - **작성일**: 2025년 01월 20일
-        (r'(\*\*작성일\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # - **작성 일자**: 2025년 01월 20일
-        (r'(\*\*작성 일자\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # - **완료일**: 2025년 01월 20일
-        (r'(^-\s*\*\*완료일\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # - **수정일**: 2025년 01월 20일
-        (r'(\*\*수정일\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # - **보류 일자**: 2025년 01월 20일
-        (r'(\*\*보류 일자\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # - **취소 일자**: 2025년 01월 20일
-        (r'(\*\*취소 일자\*\*:\s*)(\d{4}년\s*\d{1,2}월\s*\d{1,2}일)', f'\\1{today_kr}'),
-        # ### 오늘 (2025.08.21)
-        (r'(###\s*오늘\s*\()(\d{4}\.\d{2}\.\d{2})(\))', f'\\1{today_dot}\\3'),
-        # Date: 2025-08-21
-        (r'(Date:\s*)(\d{4}-\d{2}-\d{2})', f'\\1{today_iso}'),
-    ]
-    
+
     path = Path(file_path)
     if not path.exists():
         print(f"파일이 존재하지 않습니다: {file_path}")
         return
-    
+
     content = path.read_text(encoding='utf-8')
+
+    # 날짜 필드가 전혀 없는 파일이 대부분 — regex 전에 저렴하게 걸러냄
+    if not any(anchor in content for anchor in _ANCHORS):
+        print(f"업데이트할 날짜 필드 없음: {file_path}")
+        return
+
     updated = False
-    
-    for pattern, replacement in patterns:
-        new_content = re.sub(pattern, replacement, content)
+
+    passes = [
+        (LABEL_RE, lambda m: f'{m.group(1)}{today_kr}'),
+        (TODAY_HEADER_RE, lambda m: f'{m.group(1)}{today_dot}{m.group(3)}'),
+        (DATE_LINE_RE, lambda m: f'{m.group(1)}{today_iso}'),
+    ]
+
+    for compiled, repl in passes:
+        new_content = compiled.sub(repl, content)
         if new_content != content:
             content = new_content
             updated = True
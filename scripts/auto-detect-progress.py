@@ -7,10 +7,84 @@ Auto-detect Progress Script
 import os
 import re
 import json
+import time
 import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
+
+# 상태 파일 JSON 처리: orjson(C 파서)이 있으면 사용, 없으면 표준 json
+try:
+    import orjson
+
+    def _load_json(path):
+        return orjson.loads(path.read_bytes())
+
+    def _dump_json(path, data):
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+except ImportError:
+    def _load_json(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def _dump_json(path, data):
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+# 상태 파일이 무한히 커지지 않도록 completed_tasks는 최근 항목만 유지
+COMPLETED_TASKS_LIMIT = 1000
+
+# 기능별 관련 파일 목록 (변경 감지와 구현 감지가 공유)
+FEATURE_FILES = {
+    'excel_export': [
+        'backend/routes/admin/leaveAdmin.js',
+        'backend/services/LeaveExcelService.js',
+        'frontend/src/components/UnifiedLeaveOverview.tsx'
+    ],
+    'virtual_scroll': [
+        'frontend/src/components/VirtualScrollList.tsx',
+        'frontend/package.json'  # react-window 추가 확인
+    ],
+    'charts': [
+        'frontend/src/components/LeaveCharts.tsx',
+        'frontend/package.json'  # recharts 추가 확인
+    ]
+}
+
+# 미완료 작업 텍스트에서 작업 유형을 찾는 키워드 매처
+# (키워드마다 in / lower() 검사를 반복하는 대신 한 번의 검색으로 분류)
+KEYWORD_RE = re.compile(
+    r'(?P<excel>excel)|(?P<vscroll>virtual|scroll)|(?P<test>test)',
+    re.IGNORECASE
+)
+
+# 키워드 그룹 → 작업 패턴
+KEYWORD_PATTERNS = {
+    'excel': {
+        'files': ['LeaveExcelService', 'exportExcel'],
+        'type': 'excel_export'
+    },
+    'vscroll': {
+        'files': ['VirtualScroll', 'react-window'],
+        'type': 'virtual_scroll'
+    },
+    'test': {
+        'files': ['.test.', '.spec.'],
+        'type': 'test'
+    },
+}
+
+def _plan_files(root):
+    """루트 디렉토리의 *-plan.md 파일 목록 반환
+
+    glob을 두 번 돌리면 FEAT-*-plan.md가 *-plan.md에도 매칭되어 중복
+    스캔되므로, scandir 한 번으로 읽고 이름 필터만 적용
+    """
+    with os.scandir(root) as it:
+        return [Path(entry.path) for entry in it
+                if entry.is_file() and entry.name.endswith('-plan.md')]
 
 class AutoProgressDetector:
     def __init__(self):
@@ -18,63 +92,108 @@ class AutoProgressDetector:
         self.state_file = self.root_dir / '.progress-state.json'
         self.current_state = self.load_state()
         self.detected_completions = []
+        # plan 파일 내용 캐시: {path: (mtime, content)}
+        # analyze_plan_files에서 채우고 update_plan_files에서 재사용
+        self._plan_cache = {}
+        # 상태가 실제로 바뀌었을 때만 저장하기 위한 dirty 플래그
+        self._dirty = False
         
     def load_state(self):
         """이전 상태 로드"""
         if self.state_file.exists():
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            return _load_json(self.state_file)
         return {
             'file_hashes': {},
             'test_results': {},
+            'plan_cache': {},
             'last_check': None,
             'completed_tasks': []
         }
         
     def save_state(self):
-        """현재 상태 저장"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self.current_state, f, indent=2)
+        """현재 상태 저장 (변경이 없으면 기록 생략)
+
+        /mnt/d 같은 DrvFS 마운트에서는 쓰기 비용이 커서 no-op 실행에서는
+        저장하지 않음. 임시 파일에 쓴 뒤 os.replace로 원자적 교체
+        """
+        if not self._dirty:
+            return
+
+        completed = self.current_state['completed_tasks']
+        if len(completed) > COMPLETED_TASKS_LIMIT:
+            self.current_state['completed_tasks'] = \
+                completed[-COMPLETED_TASKS_LIMIT:]
+
+        tmp_file = self.state_file.with_suffix('.json.tmp')
+        _dump_json(tmp_file, self.current_state)
+        os.replace(tmp_file, self.state_file)
+        self._dirty = False
             
     def get_file_hash(self, filepath):
-        """파일의 해시값 계산"""
+        """파일의 해시값 계산
+
+        (mtime_ns, size)가 이전 상태와 같으면 파일을 읽지 않고
+        캐시된 해시를 반환 (변경 없는 경우 stat() 한 번으로 끝)
+        """
         if not filepath.exists():
             return None
-        with open(filepath, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
-            
+
+        st = filepath.stat()
+        stat_sig = [st.st_mtime_ns, st.st_size]
+
+        cached = self.current_state['file_hashes'].get(str(filepath))
+        if isinstance(cached, dict) and cached.get('stat') == stat_sig:
+            return cached['hash']
+
+        # 64 KiB 단위 스트리밍 해시 — 파일 전체를 bytes로 올리지 않음
+        h = hashlib.blake2b(digest_size=16)
+        with open(filepath, 'rb', buffering=0) as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                h.update(chunk)
+        file_hash = h.hexdigest()
+
+        self.current_state['file_hashes'][str(filepath)] = {
+            'stat': stat_sig,
+            'hash': file_hash
+        }
+        self._dirty = True
+        return file_hash
+
     def detect_code_changes(self):
         """코드 변경사항 감지"""
-        patterns = {
-            'excel_export': [
-                'backend/routes/admin/leaveAdmin.js',
-                'backend/services/LeaveExcelService.js',
-                'frontend/src/components/UnifiedLeaveOverview.tsx'
-            ],
-            'virtual_scroll': [
-                'frontend/src/components/VirtualScrollList.tsx',
-                'frontend/package.json'  # react-window 추가 확인
-            ],
-            'charts': [
-                'frontend/src/components/LeaveCharts.tsx',
-                'frontend/package.json'  # recharts 추가 확인
-            ]
-        }
-        
-        changes = {}
-        for feature, files in patterns.items():
+        # 존재하는 후보 파일과 이전 해시를 먼저 수집
+        # (이전 상태는 get_file_hash가 갱신하기 전에 읽어둠,
+        #  구버전 상태 파일은 해시 문자열만 저장했으므로 양쪽 모두 지원)
+        candidates = []
+        old_hashes = {}
+        for feature, files in FEATURE_FILES.items():
             for file_path in files:
                 full_path = self.root_dir / file_path
                 if full_path.exists():
-                    current_hash = self.get_file_hash(full_path)
-                    old_hash = self.current_state['file_hashes'].get(str(full_path))
-                    
-                    if old_hash and current_hash != old_hash:
-                        changes[feature] = changes.get(feature, [])
-                        changes[feature].append(file_path)
-                        
-                    self.current_state['file_hashes'][str(full_path)] = current_hash
-                    
+                    candidates.append((feature, file_path, full_path))
+                    cached = self.current_state['file_hashes'].get(str(full_path))
+                    old_hashes[str(full_path)] = \
+                        cached['hash'] if isinstance(cached, dict) else cached
+
+        if not candidates:
+            return {}
+
+        # 파일별 해시는 독립 작업이므로 스레드 풀에서 병렬 계산
+        # (blake2b는 C 구현 내부에서 GIL을 놓으므로 실제로 병렬화됨)
+        with ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1)
+        ) as executor:
+            hashes = list(executor.map(
+                self.get_file_hash, [c[2] for c in candidates]))
+
+        changes = {}
+        for (feature, file_path, full_path), current_hash in \
+                zip(candidates, hashes):
+            old_hash = old_hashes[str(full_path)]
+            if old_hash and current_hash != old_hash:
+                changes[feature] = changes.get(feature, [])
+                changes[feature].append(file_path)
+
         return changes
         
     def check_test_results(self):
@@ -96,94 +215,190 @@ class AutoProgressDetector:
                 if not self.current_state['last_check'] or \
                    mtime > datetime.fromisoformat(self.current_state['last_check']):
                     test_indicators.append(result_file)
-                    
+
+        if test_indicators:
+            # 최근 테스트 신호는 last_check 기준 1회만 유효해야 하므로,
+            # 신호를 소비한 실행에서는 갱신된 last_check를 반드시 저장
+            # (저장하지 않으면 같은 coverage 파일이 매 실행 "최근"으로
+            #  집계되어 자동 완료 판정을 계속 밀어올림)
+            self._dirty = True
+
         return test_indicators
         
     def analyze_plan_files(self):
-        """Plan 파일에서 작업 목록과 구현 패턴 분석"""
+        """Plan 파일에서 작업 목록과 구현 패턴 분석
+
+        파일 내용 해시가 이전 실행과 같으면 상태 파일에 저장해 둔
+        추출 결과를 재사용 — 바뀐 plan 파일만 다시 파싱
+        """
+        plan_cache = self.current_state.setdefault('plan_cache', {})
         task_patterns = {}
-        
-        plan_files = list(self.root_dir.glob('*-plan.md'))
-        plan_files.extend(list(self.root_dir.glob('FEAT-*-plan.md')))
-        
-        for plan_file in plan_files:
-            with open(plan_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
+
+        for plan_file in _plan_files(self.root_dir):
+            # get_file_hash의 mtime+size fast path 덕분에 변경이 없으면
+            # 파일을 읽지 않고 해시를 얻음
+            file_hash = self.get_file_hash(plan_file)
+            cached = plan_cache.get(str(plan_file))
+            if cached and cached.get('hash') == file_hash:
+                task_patterns.update(cached['patterns'])
+                continue
+
+            content = self._load_plan(plan_file)
+            patterns = {}
+
             # 미완료 작업 찾기
             pending_tasks = re.findall(r'- \[ \] (.+?)(?:\n|$)', content)
-            
+
             for task in pending_tasks:
-                # 작업과 관련된 파일/함수 패턴 추출
-                if 'Excel' in task or 'excel' in task:
-                    task_patterns[task] = {
-                        'files': ['LeaveExcelService', 'exportExcel'],
-                        'type': 'excel_export'
-                    }
-                elif 'virtual' in task.lower() or 'scroll' in task.lower():
-                    task_patterns[task] = {
-                        'files': ['VirtualScroll', 'react-window'],
-                        'type': 'virtual_scroll'
-                    }
-                elif 'test' in task.lower():
-                    task_patterns[task] = {
-                        'files': ['.test.', '.spec.'],
-                        'type': 'test'
-                    }
-                    
+                # 작업과 관련된 파일/함수 패턴 추출 (첫 키워드 매칭으로 분류)
+                match = KEYWORD_RE.search(task)
+                if match:
+                    patterns[task] = KEYWORD_PATTERNS[match.lastgroup]
+
+            plan_cache[str(plan_file)] = {
+                'hash': file_hash,
+                'patterns': patterns
+            }
+            self._dirty = True
+            task_patterns.update(patterns)
+
         return task_patterns
-        
+
+    def _load_plan(self, plan_file):
+        """plan 파일 내용 반환 (mtime이 같으면 캐시 재사용)"""
+        mtime = plan_file.stat().st_mtime
+        cached = self._plan_cache.get(plan_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(plan_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        self._plan_cache[plan_file] = (mtime, content)
+        return content
+
+    def _store_plan(self, plan_file, content):
+        """plan 파일 저장 후 캐시 갱신"""
+        with open(plan_file, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self._plan_cache[plan_file] = (plan_file.stat().st_mtime, content)
+
     def detect_implementation(self, task_patterns):
         """패턴 기반으로 구현 완료 감지"""
         completed = []
-        
+
+        # 파일 인덱스는 리터럴 경로 fast path가 빗나갈 때만 생성
+        file_index = None
+        # 기능 유형별 파일명 패턴 alternation (유형당 한 번만 컴파일)
+        feature_re = {}
+
+        # 기준 시각은 루프 밖에서 한 번만 계산 (최근 24시간)
+        cutoff_ts = time.time() - 24 * 3600
+
         for task, pattern in task_patterns.items():
-            # 관련 파일 존재 확인
-            for file_pattern in pattern['files']:
-                # Frontend 파일 검색
-                frontend_files = list(self.root_dir.glob(f'frontend/**/*{file_pattern}*'))
-                backend_files = list(self.root_dir.glob(f'backend/**/*{file_pattern}*'))
-                
-                if frontend_files or backend_files:
-                    # 파일이 최근에 생성/수정되었는지 확인
-                    for f in frontend_files + backend_files:
-                        mtime = datetime.fromtimestamp(f.stat().st_mtime)
-                        # 최근 24시간 내 수정된 파일
-                        if mtime > datetime.now() - timedelta(hours=24):
-                            completed.append({
-                                'task': task,
-                                'evidence': f'File created/modified: {f.name}',
-                                'type': pattern['type']
-                            })
-                            break
-                            
+            # 기능별로 이미 알고 있는 리터럴 경로를 먼저 확인 —
+            # 대부분의 경우 트리 스캔 없이 여기서 끝남
+            found_literal = False
+            for literal in FEATURE_FILES.get(pattern['type'], ()):
+                path = self.root_dir / literal
+                if path.exists() and path.stat().st_mtime > cutoff_ts:
+                    completed.append({
+                        'task': task,
+                        'evidence': f'File created/modified: {path.name}',
+                        'type': pattern['type']
+                    })
+                    found_literal = True
+                    break
+            if found_literal:
+                continue
+
+            # 리터럴 경로에 없으면 인덱스에서 파일명 패턴으로 검색
+            if file_index is None:
+                # frontend/backend 트리를 한 번만 걸어 파일 인덱스 구성
+                # (패턴마다 전체 트리를 glob하지 않음, node_modules 제외)
+                file_index = self._build_file_index()
+
+            regex = feature_re.get(pattern['type'])
+            if regex is None:
+                regex = re.compile('|'.join(
+                    re.escape(fp) for fp in pattern['files']))
+                feature_re[pattern['type']] = regex
+
+            # 인덱스를 한 번 훑으며 파일명 패턴과 최근 수정 여부를 확인
+            for _path, name, mtime_ts in file_index:
+                if mtime_ts > cutoff_ts and regex.search(name):
+                    completed.append({
+                        'task': task,
+                        'evidence': f'File created/modified: {name}',
+                        'type': pattern['type']
+                    })
+                    break
+
         return completed
+
+    def _build_file_index(self):
+        """frontend/backend 하위 파일의 (경로, 파일명, mtime) 인덱스 생성"""
+        return [
+            (p, p.name, p.stat().st_mtime)
+            for p in itertools.chain(self.root_dir.glob('frontend/**/*'),
+                                     self.root_dir.glob('backend/**/*'))
+            if 'node_modules' not in p.parts and p.is_file()
+        ]
         
     def check_running_services(self):
-        """실행 중인 서비스와 포트 확인"""
+        """실행 중인 서비스와 포트 확인
+
+        ss/ps를 fork해서 전체 출력을 텍스트로 받는 대신 /proc을 직접
+        읽음 — 프로세스 생성 없이 첫 매칭에서 바로 끝남
+        """
         indicators = {}
-        
+
         try:
             # 포트 확인 (개발 서버)
-            result = subprocess.run(['ss', '-tuln'], capture_output=True, text=True)
-            output = result.stdout
-            
-            if ':3727' in output:  # Frontend dev server
+            ports = self._listening_ports()
+
+            if 3727 in ports:  # Frontend dev server
                 indicators['frontend'] = 'running'
-            if ':5455' in output or ':5456' in output:  # Backend server
+            if 5455 in ports or 5456 in ports:  # Backend server
                 indicators['backend'] = 'running'
-                
+
             # npm scripts 실행 확인
-            ps_result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            ps_output = ps_result.stdout
-            
-            if 'npm run dev' in ps_output or 'vite' in ps_output:
+            if self._dev_process_running():
                 indicators['dev_mode'] = True
-                
+
         except:
             pass
-            
+
         return indicators
+
+    def _listening_ports(self):
+        """LISTEN 상태 TCP 소켓의 로컬 포트 집합 (/proc/net/tcp 파싱)"""
+        ports = set()
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table) as f:
+                    next(f)  # 헤더 줄 건너뛰기
+                    for line in f:
+                        fields = line.split()
+                        # state 0A = LISTEN, local_address는 ip:port(16진수)
+                        if fields[3] == '0A':
+                            ports.add(int(fields[1].rsplit(':', 1)[1], 16))
+            except (OSError, StopIteration, IndexError, ValueError):
+                continue
+        return ports
+
+    def _dev_process_running(self):
+        """npm run dev / vite 프로세스 실행 여부 (/proc/[pid]/cmdline 확인)"""
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    cmdline = f.read()
+            except OSError:
+                continue  # 프로세스가 이미 종료됨
+            if b'vite' in cmdline or (b'npm' in cmdline and b'dev' in cmdline):
+                return True
+        return False
         
     def infer_completions(self):
         """모든 신호를 종합해 완료된 작업 추론"""
@@ -245,37 +460,44 @@ class AutoProgressDetector:
     def update_plan_files(self, completions):
         """Plan 파일 자동 업데이트"""
         updates = []
-        
-        for completion in completions:
-            task = completion['task']
-            
-            # 모든 plan 파일에서 해당 task 찾기
-            plan_files = list(self.root_dir.glob('*-plan.md'))
-            plan_files.extend(list(self.root_dir.glob('FEAT-*-plan.md')))
-            
-            for plan_file in plan_files:
-                with open(plan_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # 정확한 task 매칭
-                pattern = rf'- \[ \] ({re.escape(task[:50])}.*?)(?:\n|$)'
-                if re.search(pattern, content):
-                    # 체크박스 업데이트
-                    new_content = re.sub(
-                        pattern,
-                        rf'- [x] \1 ✅ ({datetime.now().strftime("%Y.%m.%d")} 자동 감지)',
-                        content
-                    )
-                    
-                    with open(plan_file, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                        
+        if not completions:
+            return updates
+
+        # 완료 작업 접두어(50자)를 alternation 하나로 묶어
+        # plan 파일당 한 번의 치환으로 모든 완료 작업을 반영
+        completion_by_prefix = {c['task'][:50]: c for c in completions}
+        alternation = '|'.join(
+            re.escape(prefix) for prefix in completion_by_prefix)
+        pattern = re.compile(rf'- \[ \] ((?:{alternation}).*?)(?:\n|$)')
+        today = datetime.now().strftime('%Y.%m.%d')
+
+        for plan_file in _plan_files(self.root_dir):
+            content = self._load_plan(plan_file)
+            matched = []
+
+            def check_off(m):
+                line = m.group(1)
+                completion = next(
+                    (c for prefix, c in completion_by_prefix.items()
+                     if line.startswith(prefix)), None)
+                if completion is None:
+                    return m.group(0)
+                matched.append(completion)
+                tail = '\n' if m.group(0).endswith('\n') else ''
+                return f'- [x] {line} ✅ ({today} 자동 감지){tail}'
+
+            # 체크박스 업데이트 (실제 변경이 있을 때만 파일 기록)
+            new_content = pattern.sub(check_off, content)
+            if new_content != content:
+                self._store_plan(plan_file, new_content)
+
+                for completion in matched:
                     updates.append({
                         'file': plan_file.name,
-                        'task': task,
+                        'task': completion['task'],
                         'confidence': completion['confidence']
                     })
-                    
+
         return updates
         
     def generate_report(self, completions, updates):
@@ -332,9 +554,13 @@ class AutoProgressDetector:
                 print(f"🔔 {len(completions)}개 완료 작업 감지됨")
                 print("자동 업데이트하려면 --auto 옵션을 사용하세요")
                 
-        # 상태 저장
+        # 상태 저장 — last_check는 상태에 다른 변경이 있을 때만 함께 기록됨
+        # (no-op 실행에서는 파일을 다시 쓰지 않기 위해)
         self.current_state['last_check'] = datetime.now().isoformat()
-        self.current_state['completed_tasks'].extend([c['task'] for c in completions])
+        if completions:
+            self.current_state['completed_tasks'].extend(
+                [c['task'] for c in completions])
+            self._dirty = True
         self.save_state()
         
         # 리포트 생성
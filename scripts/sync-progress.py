@@ -9,6 +9,22 @@ import re
 from datetime import datetime
 from pathlib import Path
 
+# 체크박스 한 줄을 완료/미완료 구분과 함께 한 번에 추출
+# (완료용·진행중용 regex를 각각 돌리면 파일 전체를 두 번 스캔)
+TASK_RE = re.compile(r'- \[(?P<state>[x ])\] (?P<task>.+?)(?:\n|$)')
+# 미완료 작업 중 진행중 표시
+PROGRESS_MARKER_RE = re.compile(r'🔄|진행중')
+
+def _plan_files(root):
+    """루트 디렉토리의 *-plan.md 파일 목록 반환
+
+    glob을 두 번 돌리면 FEAT-*-plan.md가 *-plan.md에도 매칭되어 중복
+    스캔되므로, scandir 한 번으로 읽고 이름 필터만 적용
+    """
+    with os.scandir(root) as it:
+        return [Path(entry.path) for entry in it
+                if entry.is_file() and entry.name.endswith('-plan.md')]
+
 class ProgressSync:
     def __init__(self):
         self.root_dir = Path('/mnt/d/my_programs/HR')
@@ -19,10 +35,7 @@ class ProgressSync:
         
     def scan_plan_files(self):
         """모든 plan 파일 스캔"""
-        plan_files = list(self.root_dir.glob('*-plan.md'))
-        plan_files.extend(list(self.root_dir.glob('FEAT-*-plan.md')))
-        
-        for plan_file in plan_files:
+        for plan_file in _plan_files(self.root_dir):
             self.extract_progress(plan_file)
             
     def extract_progress(self, plan_file):
@@ -30,23 +43,23 @@ class ProgressSync:
         with open(plan_file, 'r', encoding='utf-8') as f:
             content = f.read()
             
-        # 완료된 작업 찾기
-        completed = re.findall(r'- \[x\] (.+?)(?:\n|$)', content)
-        # 진행중 작업 찾기
-        in_progress = re.findall(r'- \[ \] (.+?)(?:🔄|진행중)', content)
-        
-        for task in completed:
-            self.completed_tasks.append({
-                'file': plan_file.name,
-                'task': task,
-                'date': datetime.now().strftime('%Y.%m.%d')
-            })
-            
-        for task in in_progress:
-            self.in_progress_tasks.append({
-                'file': plan_file.name,
-                'task': task
-            })
+        # 완료/진행중 작업을 한 번의 스캔으로 추출
+        for match in TASK_RE.finditer(content):
+            task = match.group('task')
+
+            if match.group('state') == 'x':
+                self.completed_tasks.append({
+                    'file': plan_file.name,
+                    'task': task,
+                    'date': datetime.now().strftime('%Y.%m.%d')
+                })
+            else:
+                marker = PROGRESS_MARKER_RE.search(task)
+                if marker:
+                    self.in_progress_tasks.append({
+                        'file': plan_file.name,
+                        'task': task[:marker.start()]
+                    })
             
     def update_todo_file(self):
         """todo-development.md 업데이트"""
@@ -67,13 +80,24 @@ class ProgressSync:
         
     def update_progress_in_content(self, content):
         """콘텐츠에서 진행 상황 업데이트"""
-        # 완료된 작업 표시
-        for task in self.completed_tasks:
-            pattern = rf'- \[ \] (.*{re.escape(task["task"][:30])}.*)'
-            replacement = rf'- [x] \1 ✅ ({task["date"]} 완료)'
-            content = re.sub(pattern, replacement, content)
-            
-        return content
+        if not self.completed_tasks:
+            return content
+
+        # 완료 작업별로 re.sub를 반복하면 작업 수만큼 전체 재스캔이 일어나므로
+        # 작업 접두어들을 alternation 하나로 묶어 한 번에 치환
+        date_by_prefix = {task['task'][:30]: task['date']
+                          for task in self.completed_tasks}
+        alternation = '|'.join(re.escape(p) for p in date_by_prefix)
+        pattern = re.compile(rf'- \[ \] (.*(?:{alternation}).*)')
+
+        def mark_completed(match):
+            line = match.group(1)
+            for prefix, date in date_by_prefix.items():
+                if prefix in line:
+                    return f'- [x] {line} ✅ ({date} 완료)'
+            return match.group(0)
+
+        return pattern.sub(mark_completed, content)
         
     def calculate_progress(self):
         """전체 진행률 계산"""